@@ -1,8 +1,21 @@
 # main.py
 import os
 import time
+import atexit
 import re  # Para validaciones con expresiones regulares
 from services import GestorEmpleados, RepositorioEmpleados, GestorNominas, clear_screen
+from models import es_cedula_valida, es_texto_valido
+
+# Patrón precompilado para el formato año-mes (YYYYMM).
+_YYYYMM_RE = re.compile(r'\d{6}')
+
+# Pausas entre pantallas; se desactivan con NOMINA_INTERACTIVE_DELAY=0 (p. ej. en pruebas).
+INTERACTIVE_DELAY = os.environ.get('NOMINA_INTERACTIVE_DELAY', '1') != '0'
+
+def pausa(segundos: float):
+    """Espera unos segundos para que el usuario lea el mensaje, si las pausas están activas."""
+    if INTERACTIVE_DELAY:
+        time.sleep(segundos)
 
 def menu_principal():
     """Muestra el menú principal y solicita una opción válida."""
@@ -37,21 +50,17 @@ def validar_cedula():
     """Solicita y valida una cédula de 10 dígitos."""
     while True:
         cedula = input("Cédula (10 dígitos): ")
-        if cedula.isdigit() and len(cedula) == 10:
+        if es_cedula_valida(cedula):
             return cedula
         print("⚠️ La cédula debe contener exactamente 10 dígitos.")
-        time.sleep(2)
-        clear_screen()
 
 def validar_texto(campo):
     """Solicita un campo que solo contenga letras y espacios."""
     while True:
         valor = input(f"{campo} (solo texto): ")
-        if valor.replace(" ", "").isalpha():
+        if es_texto_valido(valor):
             return valor
         print(f"⚠️ El {campo} solo puede contener letras.")
-        time.sleep(2)
-        clear_screen()
 
 def validar_sueldo(mensaje="Sueldo: "):
     """Solicita y valida que el sueldo sea un número positivo."""
@@ -64,24 +73,30 @@ def validar_sueldo(mensaje="Sueldo: "):
             print("⚠️ El sueldo debe ser un número positivo.")
         else:
             print("⚠️ El sueldo solo puede contener números.")
-        time.sleep(2)
-        clear_screen()
 
 def main():
     """Función principal que ejecuta el programa."""
     repo_empleados = RepositorioEmpleados()
-    gestor_empleados = GestorEmpleados(repo_empleados)
+    try:
+        gestor_empleados = GestorEmpleados(repo_empleados)
+    except ValueError as e:
+        # Por ejemplo, una cédula duplicada en el archivo de empleados.
+        print(f"⚠️ No se pudo cargar el archivo de empleados: {e}")
+        print("Corrija el archivo y vuelva a iniciar el sistema.")
+        return
+    # Los cambios de empleados se guardan al salir del programa.
+    atexit.register(gestor_empleados.guardar_cambios_pendientes)
     gestor_nominas = GestorNominas(gestor_empleados)
 
     while True:
         opcion = menu_principal()
-        time.sleep(1)
+        pausa(1)
         clear_screen()
 
         if opcion == '1':  # Gestión de empleados
             while True:
                 opcion_empleado = menu_empleados()
-                time.sleep(1)
+                pausa(1)
                 clear_screen()
 
                 if opcion_empleado == '1':  # Crear
@@ -99,7 +114,7 @@ def main():
                         'cargo': cargo
                     }):
                         print("✅ Empleado creado exitosamente.")
-                    time.sleep(2)
+                    pausa(2)
 
                 elif opcion_empleado == '2':  # Consultar
                     empleados = gestor_empleados.consultar_empleados()
@@ -110,14 +125,14 @@ def main():
                                   f"Sueldo: ${emp.sueldo:,.2f}, Departamento: {emp.departamento}, Cargo: {emp.cargo}")
                     else:
                         print("⚠️ No hay empleados registrados.")
-                    time.sleep(3)
+                    pausa(3)
 
                 elif opcion_empleado == '3':  # Modificar
                     cedula = validar_cedula()
                     cambios = {}
                     nombre = input("Nuevo nombre (deje en blanco si no cambia): ")
                     if nombre:
-                        if nombre.replace(" ", "").isalpha():
+                        if es_texto_valido(nombre):
                             cambios['nombre'] = nombre
                         else:
                             print("⚠️ El nombre solo puede contener letras.")
@@ -135,21 +150,21 @@ def main():
 
                     departamento = input("Nuevo departamento (deje en blanco si no cambia): ")
                     if departamento:
-                        if departamento.replace(" ", "").isalpha():
+                        if es_texto_valido(departamento):
                             cambios['departamento'] = departamento
                         else:
                             print("⚠️ El departamento solo puede contener letras.")
 
                     cargo = input("Nuevo cargo (deje en blanco si no cambia): ")
                     if cargo:
-                        if cargo.replace(" ", "").isalpha():
+                        if es_texto_valido(cargo):
                             cambios['cargo'] = cargo
                         else:
                             print("⚠️ El cargo solo puede contener letras.")
 
                     if cambios and gestor_empleados.modificar_empleado(cedula, cambios):
                         print("✅ Empleado modificado exitosamente.")
-                    time.sleep(3)
+                    pausa(3)
 
                 elif opcion_empleado == '4':  # Eliminar
                     cedula = validar_cedula()
@@ -157,33 +172,34 @@ def main():
                     if confirm.lower() == 's':
                         if gestor_empleados.eliminar_empleado(cedula):
                             print("✅ Empleado eliminado exitosamente.")
-                    time.sleep(2)
+                    pausa(2)
 
                 elif opcion_empleado == '5':
+                    gestor_empleados.guardar_cambios_pendientes()
                     break
 
-                time.sleep(2)
+                pausa(2)
                 clear_screen()
 
         elif opcion == '2':  # Generar nómina
             gestor_nominas.generar_nomina_mensual()
-            time.sleep(3)
+            pausa(3)
             clear_screen()
 
         elif opcion == '3':  # Consultar estadísticas
             while True:
                 aniomes = input("Ingrese el año y mes de la nómina (YYYYMM, ej. 202401): ")
-                if re.fullmatch(r'^\d{6}$', aniomes):
+                if _YYYYMM_RE.fullmatch(aniomes):
                     gestor_nominas.consultar_estadisticas_nomina(aniomes)
                     break
                 else:
                     print("⚠️ Formato inválido. Debe ser YYYYMM (ej: 202401).")
-            time.sleep(3)
+            pausa(3)
             clear_screen()
 
         elif opcion == '4':  # Salir
             print("👋 Saliendo del sistema...")
-            time.sleep(1)
+            pausa(1)
             clear_screen()
             break
 
@@ -1,8 +1,30 @@
 import json
 from typing import List, Dict, Any, Callable
-from functools import wraps
+from functools import wraps, lru_cache
 import re
 
+# Patrones precompilados para las validaciones de empleados.
+_NAME_RE = re.compile(r'[A-Za-z\s]+')
+_CEDULA_RE = re.compile(r'\d{10}')
+
+# Campos obligatorios de un empleado.
+_REQUIRED = frozenset(('cedula', 'nombre', 'sueldo', 'departamento', 'cargo'))
+# Campos que solo pueden contener letras y espacios.
+_TEXT_FIELDS = ('nombre', 'departamento', 'cargo')
+
+@lru_cache(maxsize=4096)
+def es_texto_valido(valor: str) -> bool:
+    """
+    Indica si el texto solo contiene letras y espacios, con al menos una letra
+    (resultado memoizado).
+    """
+    return _NAME_RE.fullmatch(valor) is not None and not valor.isspace()
+
+@lru_cache(maxsize=4096)
+def es_cedula_valida(valor: str) -> bool:
+    """Indica si el texto es una cédula de 10 dígitos (resultado memoizado)."""
+    return _CEDULA_RE.fullmatch(valor) is not None
+
 def validate_empleado(func: Callable) -> Callable:
     """
     Decorador para validar los datos de un empleado antes de la creación o actualización.
@@ -14,7 +36,7 @@ def validate_empleado(func: Callable) -> Callable:
         # Valida que la entrada sea un diccionario y contenga todos los campos.
         if not isinstance(empleado, dict):
             raise TypeError("El empleado debe ser un diccionario.")
-        if not all(k in empleado for k in ['cedula', 'nombre', 'sueldo', 'departamento', 'cargo']):
+        if not _REQUIRED <= empleado.keys():
             raise ValueError("Faltan campos requeridos para el empleado.")
 
         # Validaciones de tipo de dato y formato.
@@ -23,25 +45,22 @@ def validate_empleado(func: Callable) -> Callable:
         
         # Validación de la cédula: 10 dígitos numéricos.
         cedula_str = str(empleado['cedula'])
-        if not cedula_str.isdigit() or len(cedula_str) != 10:
+        if not es_cedula_valida(cedula_str):
             raise ValueError("La cédula debe ser un número de 10 dígitos exactamente.")
         
         # Validación de campos de texto con expresiones regulares.
         # Permite letras y espacios, pero no números ni símbolos.
-        if not re.fullmatch(r'^[a-zA-Z\s]+$', empleado['nombre']):
-            raise ValueError("El nombre solo puede contener letras y espacios.")
-        
-        if not re.fullmatch(r'^[a-zA-Z\s]+$', empleado['departamento']):
-            raise ValueError("El departamento solo puede contener letras y espacios.")
-        
-        if not re.fullmatch(r'^[a-zA-Z\s]+$', empleado['cargo']):
-            raise ValueError("El cargo solo puede contener letras y espacios.")
+        for campo in _TEXT_FIELDS:
+            if not es_texto_valido(empleado[campo]):
+                raise ValueError(f"El {campo} solo puede contener letras y espacios.")
             
         return func(self, empleado)
     return wrapper
 
 class Empleado:
     """Clase que representa a un empleado de la empresa."""
+    __slots__ = ('cedula', 'nombre', 'sueldo', 'departamento', 'cargo')
+
     def __init__(self, cedula: str, nombre: str, sueldo: float, departamento: str, cargo: str):
         self.cedula = cedula
         self.nombre = nombre
@@ -51,10 +70,18 @@ class Empleado:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convierte el objeto Empleado en un diccionario para guardarlo en JSON."""
-        return self.__dict__
+        return {
+            "cedula": self.cedula,
+            "nombre": self.nombre,
+            "sueldo": self.sueldo,
+            "departamento": self.departamento,
+            "cargo": self.cargo
+        }
 
 class DetalleNomina:
     """Clase que representa el cálculo de la nómina para un empleado en particular."""
+    __slots__ = ('id', 'empleado', 'sueldo', 'bono', 'tot_ing', 'iess', 'prestamo', 'tot_des', 'neto')
+
     def __init__(self, id: int, empleado: Empleado, sueldo: float, bono: float, prestamo: float):
         self.id = id
         self.empleado = empleado
@@ -86,6 +113,7 @@ class Nomina:
     """Clase principal que representa la nómina mensual consolidada."""
     BONO = 50.0  # Atributo de clase para el valor del bono.
     PRESTAMO = 20.0 # Atributo de clase para el valor del préstamo.
+    __slots__ = ('id', 'aniomes', 'tot_ing', 'tot_des', 'neto', 'detalles')
 
     def __init__(self, id: int, aniomes: str):
         self.id = id
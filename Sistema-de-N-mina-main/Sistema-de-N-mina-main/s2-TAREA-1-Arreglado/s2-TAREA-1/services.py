@@ -1,15 +1,53 @@
 import json
+import marshal
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from models import Empleado, Nomina, DetalleNomina, validate_empleado
-from functools import reduce
+from typing import List, Dict, Any, Optional, Tuple, ValuesView
+from models import Empleado, Nomina, validate_empleado
 import os
+import sys
 import datetime
 import time
+from math import fsum
 
 def clear_screen():
-    """Limpia la pantalla del terminal."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """
+    Limpia la pantalla del terminal. Si la salida no es una terminal (tubería,
+    archivo, CI) no hace nada. En Windows se usa 'cls', porque la consola
+    clásica no interpreta secuencias ANSI; en el resto se escribe la secuencia
+    ANSI directamente, sin lanzar un proceso.
+    """
+    if not sys.stdout.isatty():
+        return
+    if os.name == 'nt':
+        os.system('cls')
+    elif os.environ.get('TERM') == 'dumb':
+        os.system('clear')
+    else:
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
+
+def _escribir_json(archivo: str, datos: Any):
+    """
+    Serializa los datos una sola vez y los escribe en un archivo temporal
+    que luego reemplaza al original, para no dejar archivos a medio escribir.
+    """
+    contenido = json.dumps(datos, indent=2).encode('utf-8')
+    temporal = archivo + '.tmp'
+    try:
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+            # Asegura que el contenido esté en disco antes del reemplazo.
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+    except BaseException:
+        # Si la escritura falla (p. ej. disco lleno) no se deja el temporal,
+        # sin ocultar el error original si la limpieza también falla.
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
 
 class Repositorio(ABC):
     """Clase abstracta que define la interfaz para la persistencia de datos."""
@@ -22,74 +60,150 @@ class Repositorio(ABC):
         pass
 
 class RepositorioEmpleados(Repositorio):
-    """Implementación concreta del repositorio para los empleados, usando un archivo JSON."""
+    """
+    Implementación concreta del repositorio para los empleados, usando un archivo JSON.
+    Cada vez que se guardan los datos se escribe además una caché oculta junto al
+    archivo (por ejemplo .empleados.cache), en formato marshal, que solo admite tipos
+    básicos y no ejecuta código al leerse. La caché guarda los datos ya decodificados
+    y la identidad del JSON (inodo, tamaño y fecha de modificación); si el JSON no
+    cambió desde entonces, al cargar se evita volver a parsearlo. Una carga que solo
+    lee el JSON no crea la caché.
+    """
     def __init__(self, archivo: str = 'empleados.json'):
         self.archivo = archivo
+        directorio, nombre = os.path.split(archivo)
+        base = os.path.splitext(nombre)[0]
+        self.archivo_cache = os.path.join(directorio, f".{base}.cache")
         
     def cargar_datos(self) -> List[Dict[str, Any]]:
-        """Lee los datos de empleados desde el archivo JSON."""
+        """Lee los datos de empleados desde la caché o, si está desactualizada, desde el JSON."""
         if not os.path.exists(self.archivo):
             return []
-        with open(self.archivo, 'r') as f:
-            return json.load(f)
+        datos = self._leer_cache(self._clave_archivo())
+        if datos is not None:
+            return datos
+        with open(self.archivo, 'rb') as f:
+            return json.loads(f.read())
 
     def guardar_datos(self, datos: List[Dict[str, Any]]):
-        """Guarda los datos de empleados en el archivo JSON."""
-        with open(self.archivo, 'w') as f:
-            json.dump(datos, f, indent=2)
+        """Guarda los datos de empleados en el archivo JSON y actualiza la caché."""
+        _escribir_json(self.archivo, datos)
+        self._guardar_cache(self._clave_archivo(), datos)
+
+    def _clave_archivo(self) -> Tuple[int, int, int]:
+        """
+        Identifica la versión actual del JSON. La fecha de modificación sola no basta:
+        dos escrituras en el mismo instante, o sistemas de archivos con fechas poco
+        precisas (FAT, SMB), la repiten; por eso se combina con el inodo y el tamaño.
+        """
+        info = os.stat(self.archivo)
+        return (info.st_ino, info.st_size, info.st_mtime_ns)
+
+    def _leer_cache(self, clave: Tuple[int, int, int]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Devuelve los datos de la caché si corresponden a la versión indicada del JSON
+        y tienen la forma esperada; en cualquier otro caso devuelve None.
+        """
+        try:
+            with open(self.archivo_cache, 'rb') as f:
+                contenido = marshal.load(f)
+        except Exception:
+            return None  # Caché inexistente o corrupta: se vuelve a leer el JSON.
+        if not (isinstance(contenido, tuple) and len(contenido) == 2):
+            return None
+        clave_cache, datos = contenido
+        if type(clave_cache) is not tuple or clave_cache != clave:
+            return None
+        if not (isinstance(datos, list) and all(isinstance(e, dict) for e in datos)):
+            return None
+        return datos
+
+    def _guardar_cache(self, clave: Tuple[int, int, int], datos: List[Dict[str, Any]]):
+        """Escribe la caché asociada a la versión indicada del JSON."""
+        try:
+            with open(self.archivo_cache, 'wb') as f:
+                marshal.dump((clave, datos), f)
+        except (OSError, ValueError):
+            pass  # La caché es opcional; si no se puede escribir se ignora.
 
 class GestorEmpleados:
     """
     Clase que gestiona las operaciones de CRUD para los empleados.
-    Interactúa con el Repositorio para la persistencia.
+    Interactúa con el Repositorio para la persistencia. Los cambios se
+    mantienen en memoria y solo se escriben al archivo al llamar a
+    guardar_cambios_pendientes (main lo hace al volver del menú de empleados
+    y al salir del programa). Si el proceso termina de forma abrupta (cierre
+    de la terminal, SIGHUP, un fallo), se pierden los cambios hechos desde
+    la última escritura.
     """
     def __init__(self, repo: RepositorioEmpleados):
         self.repo = repo
-        self.empleados: List[Empleado] = self.cargar_empleados()
+        self.empleados: Dict[str, Empleado] = self.cargar_empleados()
+        self._dirty = False
 
-    def cargar_empleados(self) -> List[Empleado]:
-        """Carga los empleados desde el repositorio."""
-        datos = self.repo.cargar_datos()
-        return [Empleado(**e) for e in datos]
+    def cargar_empleados(self) -> Dict[str, Empleado]:
+        """
+        Carga los empleados desde el repositorio, indexados por cédula.
+        El diccionario conserva el orden del archivo. Si una cédula aparece
+        más de una vez se lanza un error, para no descartar registros en
+        silencio al guardar.
+        """
+        empleados: Dict[str, Empleado] = {}
+        for e in self.repo.cargar_datos():
+            if e['cedula'] in empleados:
+                raise ValueError(f"La cédula {e['cedula']} está duplicada en {self.repo.archivo}.")
+            empleados[e['cedula']] = Empleado(**e)
+        return empleados
 
     def guardar_empleados(self):
         """Guarda la lista de empleados en el repositorio."""
-        datos = [e.to_dict() for e in self.empleados]
+        datos = [e.to_dict() for e in self.empleados.values()]
         self.repo.guardar_datos(datos)
+        self._dirty = False
+
+    def guardar_cambios_pendientes(self):
+        """Guarda los empleados solo si hubo cambios desde la última escritura."""
+        if self._dirty:
+            self.guardar_empleados()
 
     @validate_empleado
     def crear_empleado(self, nuevo_empleado: Dict[str, Any]):
-        """Crea un nuevo empleado si no existe y lo guarda."""
-        if any(e.cedula == nuevo_empleado['cedula'] for e in self.empleados):
+        """Crea un nuevo empleado si no existe."""
+        if nuevo_empleado['cedula'] in self.empleados:
             print("Error: Ya existe un empleado con esa cédula.")
             return False
-        self.empleados.append(Empleado(**nuevo_empleado))
-        self.guardar_empleados()
+        self.empleados[nuevo_empleado['cedula']] = Empleado(**nuevo_empleado)
+        self._dirty = True
         return True
 
-    def consultar_empleados(self) -> List[Empleado]:
-        """Devuelve la lista completa de empleados."""
-        return self.empleados
+    def consultar_empleados(self) -> ValuesView[Empleado]:
+        """Devuelve todos los empleados, en orden de registro."""
+        return self.empleados.values()
 
     def modificar_empleado(self, cedula: str, cambios: Dict[str, Any]):
         """Modifica los datos de un empleado existente."""
-        empleado_encontrado: Optional[Empleado] = next((e for e in self.empleados if e.cedula == cedula), None)
+        empleado_encontrado: Optional[Empleado] = self.empleados.get(cedula)
         if not empleado_encontrado:
             print("Error: Empleado no encontrado.")
             return False
+        nueva_cedula = cambios.get('cedula', cedula)
+        if nueva_cedula != cedula and nueva_cedula in self.empleados:
+            print("Error: Ya existe un empleado con esa cédula.")
+            return False
         for key, value in cambios.items():
             setattr(empleado_encontrado, key, value)
-        self.guardar_empleados()
+        if nueva_cedula != cedula:
+            # Se reconstruye el diccionario para que el empleado conserve su posición.
+            self.empleados = {nueva_cedula if k == cedula else k: e for k, e in self.empleados.items()}
+        self._dirty = True
         return True
 
     def eliminar_empleado(self, cedula: str):
-        """Elimina un empleado de la lista y del archivo."""
-        empleado_encontrado = next((e for e in self.empleados if e.cedula == cedula), None)
-        if not empleado_encontrado:
+        """Elimina un empleado por su cédula."""
+        if self.empleados.pop(cedula, None) is None:
             print("Error: Empleado no encontrado.")
             return False
-        self.empleados.remove(empleado_encontrado)
-        self.guardar_empleados()
+        self._dirty = True
         return True
 
 class GestorNominas:
@@ -104,8 +218,8 @@ class GestorNominas:
             print("No hay empleados para generar la nómina.")
             return
         
-        id_nomina = len(os.listdir('.')) + 1 # Generación simple de un ID
         aniomes = datetime.date.today().strftime('%Y%m')
+        id_nomina = int(aniomes) # Hay una nómina por mes, el año-mes sirve como ID
         
         nomina = Nomina(id=id_nomina, aniomes=aniomes)
         
@@ -116,8 +230,7 @@ class GestorNominas:
             id_detalle += 1
         
         nombre_archivo = f"nomina_{aniomes}.json"
-        with open(nombre_archivo, 'w') as f:
-            json.dump(nomina.to_dict(), f, indent=2)
+        _escribir_json(nombre_archivo, nomina.to_dict())
             
         print(f"Nómina generada exitosamente en {nombre_archivo}")
 
@@ -128,42 +241,32 @@ class GestorNominas:
             print("Error: No se encontró la nómina para el mes y año especificados.")
             return
 
-        with open(nombre_archivo, 'r') as f:
-            datos_nomina = json.load(f)
+        # Se lee el archivo completo de una vez y se decodifica en memoria.
+        with open(nombre_archivo, 'rb') as f:
+            datos_nomina = json.loads(f.read())
         
-        # Reconstruye el objeto Nomina para facilitar las consultas
-        nomina = Nomina(id=datos_nomina['id'], aniomes=datos_nomina['aniomes'])
-        nomina.detalles = [DetalleNomina(
-            id=d['id'],
-            # Se crea un objeto Empleado "dummy" solo con los datos necesarios para las consultas
-            empleado=Empleado(cedula="", nombre=d['empleado'], sueldo=d['sueldo'], departamento="", cargo=""),
-            sueldo=d['sueldo'],
-            bono=d['bono'],
-            prestamo=d['prestamo']
-        ) for d in datos_nomina['detalles']]
+        # Organiza los detalles por columnas (una lista por campo) en lugar de
+        # reconstruir objetos Empleado/DetalleNomina solo para las consultas.
+        # El neto ya fue calculado al generar la nómina, así que se lee del archivo.
+        detalles = datos_nomina['detalles']
+        nombres = [d['empleado'] for d in detalles]
+        sueldos = [d['sueldo'] for d in detalles]
+        netos = [d['neto'] for d in detalles]
 
         print(f"\n--- Estadísticas de Nómina {aniomes} ---")
         
-        # Consultas usando funciones de orden superior y list comprehensions
-        total_empleados = len(nomina.detalles)
-        total_neto = reduce(lambda acumulado, detalle: acumulado + detalle.neto, nomina.detalles, 0.0)
-        
-        sueldos = [d.sueldo for d in nomina.detalles]
-        promedio_sueldos = sum(sueldos) / len(sueldos) if sueldos else 0
-        
-        empleados_alto_sueldo = list(filter(lambda d: d.sueldo > 1000, nomina.detalles))
-        nombres_altos = [d.empleado.nombre for d in empleados_alto_sueldo]
-        
-        mayor_neto = max(nomina.detalles, key=lambda d: d.neto, default=None)
-        menor_neto = min(nomina.detalles, key=lambda d: d.neto, default=None)
+        total_empleados = len(detalles)
+        total_neto = fsum(netos)
+        promedio_sueldos = fsum(sueldos) / total_empleados if total_empleados else 0
+        nombres_altos = [n for n, s in zip(nombres, sueldos) if s > 1000]
 
         print(f"Total de empleados en nómina: {total_empleados}")
         print(f"Total neto pagado: ${total_neto:,.2f}")
         print(f"Promedio de sueldos: ${promedio_sueldos:,.2f}")
         print(f"Empleados con sueldo > $1000: {nombres_altos}")
         
-        if mayor_neto:
-            print(f"Empleado con mayor neto: {mayor_neto.empleado.nombre} (${mayor_neto.neto:,.2f})")
-            
-        if menor_neto:
-            print(f"Empleado con menor neto: {menor_neto.empleado.nombre} (${menor_neto.neto:,.2f})")
\ No newline at end of file
+        if netos:
+            idx_max = max(range(total_empleados), key=netos.__getitem__)
+            idx_min = min(range(total_empleados), key=netos.__getitem__)
+            print(f"Empleado con mayor neto: {nombres[idx_max]} (${netos[idx_max]:,.2f})")
+            print(f"Empleado con menor neto: {nombres[idx_min]} (${netos[idx_min]:,.2f})")